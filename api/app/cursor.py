@@ -1,24 +1,60 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import base64
+import binascii
+import hashlib
+import hmac
+import struct
+import time
 from typing import Any
 
-from itsdangerous import BadSignature, BadTimeSignature, URLSafeTimedSerializer
-
 from .config import settings
 
-_serializer = URLSafeTimedSerializer(settings.secret_key, salt='charity-recommender-cursor')
+# Byte length of the query signature digest built in main.build_query_signature.
+SIGNATURE_SIZE = 16
+
+# page, page_size, total, query signature digest, issued_at (epoch seconds; only
+# used for the TTL check, so it is not handed back to callers)
+_CURSOR = struct.Struct(f'>IHI{SIGNATURE_SIZE}sI')
+_MAC_SIZE = 8
+_key = hashlib.blake2b(settings.secret_key.encode('utf-8'), digest_size=32, person=b'charity-cursor').digest()
+
+
+def _mac(body: bytes) -> bytes:
+  return hashlib.blake2b(body, key=_key, digest_size=_MAC_SIZE).digest()
 
 
 def encode_cursor(payload: dict[str, Any]) -> str:
-  enriched = {**payload, 'issued_at': datetime.now(timezone.utc).isoformat()}
-  return _serializer.dumps(enriched)
+  signature = bytes.fromhex(payload['signature'])
+  if len(signature) != SIGNATURE_SIZE:
+    # struct would silently pad or truncate it, and every cursor would then
+    # fail to match its query.
+    raise ValueError(f'Cursor signature must be {SIGNATURE_SIZE} bytes, got {len(signature)}')
+  body = _CURSOR.pack(
+    payload['page'],
+    payload['page_size'],
+    payload['total'],
+    signature,
+    int(time.time()),
+  )
+  return base64.urlsafe_b64encode(body + _mac(body)).rstrip(b'=').decode('ascii')
 
 
 def decode_cursor(token: str) -> dict[str, Any] | None:
   try:
-    return _serializer.loads(token, max_age=settings.cursor_ttl_seconds)
-  except BadTimeSignature:
-    return None
-  except BadSignature as exc:  # includes expired signature with tampering
+    raw = base64.b64decode(token + '=' * (-len(token) % 4), altchars=b'-_', validate=True)
+  except (binascii.Error, ValueError) as exc:
     raise ValueError('Invalid cursor signature') from exc
+  body, mac = raw[:-_MAC_SIZE], raw[-_MAC_SIZE:]
+  if len(body) != _CURSOR.size or not hmac.compare_digest(mac, _mac(body)):
+    raise ValueError('Invalid cursor signature')
+
+  page, page_size, total, signature, issued_at = _CURSOR.unpack(body)
+  if time.time() - issued_at > settings.cursor_ttl_seconds:
+    return None
+  return {
+    'page': page,
+    'page_size': page_size,
+    'total': total,
+    'signature': signature.hex(),
+  }
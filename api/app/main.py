@@ -1,26 +1,33 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import random
 import subprocess
+import time
 from datetime import datetime, timezone
+from functools import cache, lru_cache
 from typing import Any, Dict, List, Sequence
 
-from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
 
 from .config import settings
-from .cursor import decode_cursor, encode_cursor
+from .cursor import SIGNATURE_SIZE, decode_cursor, encode_cursor
 from .data import CHARITY_POOL
 from .models import (
+  Charity,
   DailyPickResponse,
+  Explain,
   RecommendRequest,
   RecommendResponse,
   StatusResponse,
 )
 from .rate_limit import RateLimitExceeded, RateLimiter
 
+# Mixed with the UTC day index to seed the daily rotation.
+_SECRET_SEED = int.from_bytes(hashlib.blake2b(settings.secret_key.encode('utf-8'), digest_size=8).digest(), 'big')
+
 ISSUE_TO_NTEE = {
   'health': 'E70',
   'education': 'B82',
@@ -32,13 +39,50 @@ ISSUE_TO_NTEE = {
   'other': 'Z99',
 }
 
-VERSION = None
 
+def _index_charity(charity: Dict[str, Any]) -> Dict[str, Any]:
+  # Precompute the lookup fields filter_charities needs so requests never
+  # rebuild them from the static pool. The response model is validated once
+  # here and reused by every recommendation that includes the charity.
+  return {
+    **charity,
+    '_location_folded': (charity.get('location') or '').casefold(),
+    '_topics_set': frozenset(charity['topics']),
+    '_model': Charity.model_validate(charity),
+  }
 
-def _detect_version() -> str:
-  global VERSION
-  if VERSION:
-    return VERSION
+
+INDEXED_POOL = [_index_charity(charity) for charity in CHARITY_POOL]
+
+
+def _membership_bits(field: str) -> Dict[str, int]:
+  # Bit i of a value's mask is set when INDEXED_POOL[i] carries that value, so
+  # a whole-pool filter is a couple of integer ANDs.
+  bits: Dict[str, int] = {}
+  for position, charity in enumerate(INDEXED_POOL):
+    values = charity[field]
+    for value in values if isinstance(values, list) else [values]:
+      bits[value] = bits.get(value, 0) | (1 << position)
+  return bits
+
+
+ALL_BITS = (1 << len(INDEXED_POOL)) - 1
+ISSUE_BITS = _membership_bits('issue_family')
+IMPACT_BITS = _membership_bits('impact_modes')
+GEO_BITS = _membership_bits('geographies')
+
+
+def _charities_for(bits: int) -> List[Dict[str, Any]]:
+  charities = []
+  while bits:
+    lowest = bits & -bits
+    charities.append(INDEXED_POOL[lowest.bit_length() - 1])
+    bits ^= lowest
+  return charities
+
+
+@cache
+def _git_version() -> str:
   try:
     result = subprocess.run(
       ['git', 'rev-parse', '--short', 'HEAD'],
@@ -46,10 +90,20 @@ def _detect_version() -> str:
       check=True,
       text=True,
     )
-    VERSION = result.stdout.strip() or 'dev'
+    return result.stdout.strip() or 'dev'
   except Exception:
-    VERSION = datetime.now(timezone.utc).strftime('%Y%m%d')
-  return VERSION
+    return datetime.now(timezone.utc).strftime('%Y%m%d')
+
+
+def _detect_version() -> str:
+  # Deployments bake APP_VERSION in at build time so workers never shell out to git.
+  return settings.app_version or _git_version()
+
+
+_VERSION = _detect_version()
+_ALLOWED_ORIGINS = tuple(origin.strip() for origin in settings.cors_allow_origin.split(',') if origin.strip()) or ('*',)
+# Status never changes for the life of the process, so serialize it once.
+_STATUS_BODY = StatusResponse(ok=True, version=_VERSION, env=settings.app_env).model_dump_json().encode('utf-8')
 
 
 def build_app() -> FastAPI:
@@ -57,14 +111,13 @@ def build_app() -> FastAPI:
 
   app = FastAPI(
     title='Charity Recommender API',
-    version=_detect_version(),
+    version=_VERSION,
     docs_url='/docs' if settings.app_env != 'production' else None,
   )
 
-  allowed_origins = [origin.strip() for origin in settings.cors_allow_origin.split(',') if origin.strip()]
   app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins or ['*'],
+    allow_origins=list(_ALLOWED_ORIGINS),
     allow_methods=['GET', 'POST'],
     allow_headers=['Content-Type'],
     allow_credentials=False,
@@ -87,25 +140,33 @@ def build_app() -> FastAPI:
     return response
 
   @app.get('/api/status', response_model=StatusResponse)
-  async def status() -> StatusResponse:
-    return StatusResponse(ok=True, version=app.version or 'dev', env=settings.app_env)
+  async def get_status() -> Response:
+    return Response(content=_STATUS_BODY, media_type='application/json')
 
   @app.get('/api/daily-picks', response_model=DailyPickResponse, dependencies=[Depends(enforce_rate_limit)])
-  async def daily_picks(limit: int = Query(default=3, ge=1, le=12)) -> DailyPickResponse:
-    charities = select_daily_charities(limit)
-    return DailyPickResponse(charities=charities)
+  async def daily_picks(limit: int = Query(default=3, ge=1, le=12)) -> Response:
+    return Response(content=_daily_picks_body(_utc_day_index(), limit), media_type='application/json')
 
   @app.post('/api/recommend', response_model=RecommendResponse, dependencies=[Depends(enforce_rate_limit)])
-  async def recommend(payload: RecommendRequest) -> RecommendResponse:
+  async def recommend(payload: RecommendRequest) -> Response:
     if not payload.answers:
       raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='answers are required')
 
-    answer_map = {answer.question_id: answer.value for answer in payload.answers}
-    issue_family = answer_map.get('q_issue_family')
-    impact_mode = answer_map.get('q_impact_mode')
-    geography = answer_map.get('q_geography')
-    location = normalize_location(answer_map.get('q_location'))
-    topics = ensure_list(answer_map.get('q_topics'))
+    issue_family = impact_mode = geography = raw_location = raw_topics = None
+    for answer in payload.answers:
+      question_id = answer.question_id
+      if question_id == 'q_issue_family':
+        issue_family = answer.value
+      elif question_id == 'q_impact_mode':
+        impact_mode = answer.value
+      elif question_id == 'q_geography':
+        geography = answer.value
+      elif question_id == 'q_location':
+        raw_location = answer.value
+      elif question_id == 'q_topics':
+        raw_topics = answer.value
+    location = normalize_location(raw_location)
+    topics = ensure_list(raw_topics)
     limit = payload.limit
 
     query_signature = build_query_signature(issue_family, impact_mode, geography, location, topics)
@@ -119,7 +180,8 @@ def build_app() -> FastAPI:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
       if decoded is None:
-        return RecommendResponse(charities=[], cursor=None, explain=build_explain(issue_family, impact_mode, geography, location, topics, expired=True))
+        explain = build_explain(issue_family, impact_mode, geography, location, topics, expired=True)
+        return _json_response(RecommendResponse.model_construct(charities=[], cursor=None, explain=Explain.model_construct(**explain)))
 
       if decoded.get('signature') != query_signature:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Cursor does not match current answers.')
@@ -127,22 +189,30 @@ def build_app() -> FastAPI:
       page_index = int(decoded.get('page', 0))
       limit = int(decoded.get('page_size', limit))
 
-    suggested = filter_charities(issue_family, impact_mode, geography, location, topics)
+    suggested = cached_filter_charities(issue_family, impact_mode, geography, location, topics)
     total = len(suggested)
     start = page_index * limit
     end = start + limit
-    charities_slice = suggested[start:end]
+    charities_slice = [charity['_model'] for charity in suggested[start:end]]
 
     next_cursor = None
     if end < total:
-      next_cursor = encode_cursor({'page': page_index + 1, 'page_size': limit, 'signature': query_signature})
+      next_cursor = encode_cursor({'page': page_index + 1, 'page_size': limit, 'signature': query_signature, 'total': total})
 
     explain = build_explain(issue_family, impact_mode, geography, location, topics)
-    return RecommendResponse(charities=charities_slice, cursor=next_cursor, explain=explain)
+    return _json_response(
+      RecommendResponse.model_construct(charities=charities_slice, cursor=next_cursor, explain=Explain.model_construct(**explain))
+    )
 
   return app
 
 
+def _json_response(model: BaseModel) -> Response:
+  # Returning a Response directly skips FastAPI's response_model re-validation;
+  # callers only pass models built from trusted internal data.
+  return Response(content=model.model_dump_json(), media_type='application/json')
+
+
 def ensure_list(value: Any) -> List[str]:
   if value is None:
     return []
@@ -159,15 +229,9 @@ def normalize_location(value: Any) -> str | None:
 
 
 def build_query_signature(issue: Any, impact: Any, geography: Any, location: Any, topics: Sequence[str]) -> str:
-  payload = {
-    'issue': issue,
-    'impact': impact,
-    'geography': geography,
-    'location': location,
-    'topics': sorted(topics),
-  }
-  encoded = json.dumps(payload, sort_keys=True)
-  return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+  digest = hashlib.blake2b(digest_size=SIGNATURE_SIZE)
+  digest.update(repr((issue, impact, geography, location, tuple(sorted(topics)))).encode('utf-8'))
+  return digest.hexdigest()
 
 
 def filter_charities(
@@ -177,31 +241,67 @@ def filter_charities(
   location: str | None,
   topics: Sequence[str],
 ):
-  def matches(charity: Dict[str, Any]) -> bool:
-    if issue_family and charity['issue_family'] != issue_family:
-      return False
-    if impact_mode and impact_mode not in charity['impact_modes']:
-      return False
-    if geography and geography not in charity['geographies']:
-      return False
-    return True
-
-  pool = [charity for charity in CHARITY_POOL if matches(charity)]
-  if not pool:
-    pool = CHARITY_POOL.copy()
+  issue_family, impact_mode, geography = (_answer_key(value) for value in (issue_family, impact_mode, geography))
+
+  # The mask tables double as the sets of valid values: an unknown or
+  # unsatisfiable constraint empties the selection and we stop right there.
+  selected = ALL_BITS
+  for value, value_bits in ((issue_family, ISSUE_BITS), (impact_mode, IMPACT_BITS), (geography, GEO_BITS)):
+    if value:
+      selected &= value_bits.get(value, 0)
+      if not selected:
+        break
+
+  pool = _charities_for(selected) if selected else INDEXED_POOL.copy()
+  topics_set = frozenset(topics)
+  location_key = location.casefold() if location else None
 
   def score(charity: Dict[str, Any]) -> tuple[int, str]:
     score_value = 0
-    if location and location.lower() in charity['location'].lower():
+    if location_key and location_key in charity['_location_folded']:
       score_value -= 10
-    if topics:
-      overlap = len(set(topics) & set(charity['topics']))
-      score_value -= overlap
+    if topics_set:
+      score_value -= len(topics_set & charity['_topics_set'])
     return (score_value, charity['name'])
 
   return sorted(pool, key=score)
 
 
+def _answer_key(value: Any) -> Any:
+  # Multi-select answers never equal a single field value; make them hashable
+  # so mask lookups simply miss and they can key the filter cache.
+  return tuple(value) if isinstance(value, list) else value
+
+
+@lru_cache(maxsize=512)
+def _filter_charities_cached(
+  issue_family: Any,
+  impact_mode: Any,
+  geography: Any,
+  location: str | None,
+  topics: tuple[str, ...],
+) -> tuple[Dict[str, Any], ...]:
+  return tuple(filter_charities(issue_family, impact_mode, geography, location, topics))
+
+
+def cached_filter_charities(
+  issue_family: Any,
+  impact_mode: Any,
+  geography: Any,
+  location: str | None,
+  topics: Sequence[str],
+) -> tuple[Dict[str, Any], ...]:
+  # Keyed on the same normalized inputs as build_query_signature, so every page
+  # of a query (and identical queries from other clients) share one entry.
+  return _filter_charities_cached(
+    _answer_key(issue_family),
+    _answer_key(impact_mode),
+    _answer_key(geography),
+    location,
+    tuple(sorted(set(topics))),
+  )
+
+
 def build_explain(issue, impact, geography, location, topics, expired: bool = False):
   rationale = []
   if issue:
@@ -220,12 +320,19 @@ def build_explain(issue, impact, geography, location, topics, expired: bool = Fa
   return {'ntee': code, 'rationale': rationale}
 
 
-def select_daily_charities(limit: int):
-  seed = datetime.utcnow().strftime('%Y-%m-%d') + settings.secret_key
-  rng = random.Random(seed)
-  pool = CHARITY_POOL.copy()
-  rng.shuffle(pool)
-  return pool[:limit]
+def _utc_day_index() -> int:
+  return int(time.time() // 86400)
+
+
+def _daily_picks(day_index: int, limit: int) -> tuple[Dict[str, Any], ...]:
+  rng = random.Random(day_index ^ _SECRET_SEED)
+  return tuple(rng.sample(CHARITY_POOL, min(limit, len(CHARITY_POOL))))
+
+
+@lru_cache(maxsize=16)
+def _daily_picks_body(day_index: int, limit: int) -> bytes:
+  response = DailyPickResponse(charities=list(_daily_picks(day_index, limit)))
+  return response.model_dump_json().encode('utf-8')
 
 
 app = build_app()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Answer(BaseModel):
@@ -17,6 +17,8 @@ class RecommendRequest(BaseModel):
 
 
 class Charity(BaseModel):
+  model_config = ConfigDict(frozen=True)
+
   ein: str
   name: str
   url: Optional[str] = None
@@ -26,21 +28,29 @@ class Charity(BaseModel):
 
 
 class Explain(BaseModel):
+  model_config = ConfigDict(frozen=True)
+
   ntee: Optional[str] = None
   rationale: List[str] = Field(default_factory=list)
 
 
 class RecommendResponse(BaseModel):
+  model_config = ConfigDict(frozen=True)
+
   charities: List[Charity]
   cursor: Optional[str] = None
   explain: Explain
 
 
 class DailyPickResponse(BaseModel):
+  model_config = ConfigDict(frozen=True)
+
   charities: List[Charity]
 
 
 class StatusResponse(BaseModel):
+  model_config = ConfigDict(frozen=True)
+
   ok: bool
   version: str
   env: str
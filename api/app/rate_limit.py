@@ -1,26 +1,61 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from dataclasses import dataclass
 from threading import Lock
 from time import monotonic
 
 
+@dataclass(slots=True)
+class _Window:
+  last_bucket: int
+  counts: list[int]
+
+
 class RateLimiter:
-  def __init__(self, max_requests: int, window_seconds: int = 60) -> None:
+  # Every this many hits, tokens whose whole window has expired are dropped.
+  sweep_interval = 1024
+
+  def __init__(self, max_requests: int, window_seconds: int = 60, num_buckets: int = 6) -> None:
     self.max_requests = max_requests
     self.window_seconds = window_seconds
-    self._hits: dict[str, deque[float]] = defaultdict(deque)
+    self.num_buckets = num_buckets
+    self.bucket_seconds = window_seconds / num_buckets
+    # Each token keeps a ring of per-bucket hit counts covering the sliding window.
+    self._windows: dict[str, _Window] = {}
+    self._hits_since_sweep = 0
     self._lock = Lock()
 
   def hit(self, token: str) -> None:
-    now = monotonic()
+    bucket = int(monotonic() // self.bucket_seconds)
     with self._lock:
-      bucket = self._hits[token]
-      while bucket and now - bucket[0] > self.window_seconds:
-        bucket.popleft()
-      if len(bucket) >= self.max_requests:
+      self._hits_since_sweep += 1
+      if self._hits_since_sweep >= self.sweep_interval:
+        self._evict_expired(bucket)
+      window = self._windows.get(token)
+      if window is None:
+        window = self._windows[token] = _Window(bucket, [0] * self.num_buckets)
+      else:
+        self._advance(window, bucket)
+      if sum(window.counts) >= self.max_requests:
         raise RateLimitExceeded(self.max_requests, self.window_seconds)
-      bucket.append(now)
+      window.counts[bucket % self.num_buckets] += 1
+
+  def _evict_expired(self, bucket: int) -> None:
+    self._hits_since_sweep = 0
+    stale = [token for token, window in self._windows.items() if bucket - window.last_bucket >= self.num_buckets]
+    for token in stale:
+      del self._windows[token]
+
+  def _advance(self, window: _Window, bucket: int) -> None:
+    elapsed = bucket - window.last_bucket
+    if elapsed <= 0:
+      return
+    if elapsed >= self.num_buckets:
+      window.counts[:] = [0] * self.num_buckets
+    else:
+      for skipped in range(window.last_bucket + 1, bucket + 1):
+        window.counts[skipped % self.num_buckets] = 0
+    window.last_bucket = bucket
 
 
 class RateLimitExceeded(Exception):
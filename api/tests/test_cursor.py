@@ -0,0 +1,40 @@
+import pytest
+
+from app import cursor
+from app.config import settings
+
+PAYLOAD = {'page': 2, 'page_size': 3, 'total': 10, 'signature': 'ab' * cursor.SIGNATURE_SIZE}
+
+
+def test_round_trip():
+  assert cursor.decode_cursor(cursor.encode_cursor(PAYLOAD)) == PAYLOAD
+
+
+def test_tampered_token_is_rejected():
+  token = cursor.encode_cursor(PAYLOAD)
+  tampered = ('B' if token[0] == 'A' else 'A') + token[1:]
+  with pytest.raises(ValueError):
+    cursor.decode_cursor(tampered)
+
+
+@pytest.mark.parametrize('prefix', ['!!!!', '='])
+def test_characters_outside_alphabet_are_rejected(prefix):
+  with pytest.raises(ValueError):
+    cursor.decode_cursor(prefix + cursor.encode_cursor(PAYLOAD))
+
+
+def test_truncated_token_is_rejected():
+  with pytest.raises(ValueError):
+    cursor.decode_cursor(cursor.encode_cursor(PAYLOAD)[:-4])
+
+
+def test_expired_token_decodes_to_none(monkeypatch):
+  token = cursor.encode_cursor(PAYLOAD)
+  now = cursor.time.time()
+  monkeypatch.setattr(cursor.time, 'time', lambda: now + settings.cursor_ttl_seconds + 1)
+  assert cursor.decode_cursor(token) is None
+
+
+def test_signature_of_wrong_size_is_refused():
+  with pytest.raises(ValueError):
+    cursor.encode_cursor({**PAYLOAD, 'signature': 'ab' * (cursor.SIGNATURE_SIZE + 4)})
@@ -0,0 +1,71 @@
+import pytest
+
+from app import rate_limit
+from app.rate_limit import RateLimitExceeded, RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+  now = [0.0]
+  monkeypatch.setattr(rate_limit, 'monotonic', lambda: now[0])
+  return now
+
+
+def test_limit_reached_within_window(clock):
+  limiter = RateLimiter(3, window_seconds=60)
+  for _ in range(3):
+    limiter.hit('client')
+    clock[0] += 10
+  with pytest.raises(RateLimitExceeded):
+    limiter.hit('client')
+
+
+def test_oldest_bucket_slides_out_of_window(clock):
+  limiter = RateLimiter(3, window_seconds=60)
+  for _ in range(3):
+    limiter.hit('client')
+    clock[0] += 10
+  clock[0] = 60
+  limiter.hit('client')
+  with pytest.raises(RateLimitExceeded):
+    limiter.hit('client')
+
+
+def test_allowed_again_after_full_window(clock):
+  limiter = RateLimiter(2, window_seconds=60)
+  limiter.hit('client')
+  limiter.hit('client')
+  with pytest.raises(RateLimitExceeded):
+    limiter.hit('client')
+  clock[0] += 60
+  limiter.hit('client')
+  limiter.hit('client')
+
+
+def test_tokens_are_limited_independently(clock):
+  limiter = RateLimiter(1, window_seconds=60)
+  limiter.hit('a')
+  limiter.hit('b')
+  with pytest.raises(RateLimitExceeded):
+    limiter.hit('a')
+
+
+def test_expired_tokens_are_evicted_on_sweep(clock, monkeypatch):
+  monkeypatch.setattr(RateLimiter, 'sweep_interval', 4)
+  limiter = RateLimiter(5, window_seconds=60)
+  for token in ('a', 'b', 'c'):
+    limiter.hit(token)
+  assert len(limiter._windows) == 3
+
+  clock[0] += 60
+  limiter.hit('d')
+  assert list(limiter._windows) == ['d']
+
+
+def test_active_tokens_survive_sweep(clock, monkeypatch):
+  monkeypatch.setattr(RateLimiter, 'sweep_interval', 2)
+  limiter = RateLimiter(5, window_seconds=60)
+  limiter.hit('a')
+  clock[0] += 30
+  limiter.hit('b')
+  assert set(limiter._windows) == {'a', 'b'}